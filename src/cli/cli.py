@@ -7,7 +7,7 @@ import sys
 from datetime import datetime
 from datetime import datetime as dt
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Iterator, Optional
 
 import click
 
@@ -29,6 +29,29 @@ __version__ = "0.2.0"
 # Initialize logger
 logger = get_logger("cli")
 
+# Cheap checks run before any regex: every valid name has one of exactly two lengths.
+_QC_FILENAME_PREFIX = "QC_Status_Report_"
+_QC_FILENAME_SUFFIX = ".json"
+_QC_FILENAME_DATE_ONLY_LEN = len("QC_Status_Report_DDMMMYYYY.json")
+_QC_FILENAME_WITH_TIME_LEN = len("QC_Status_Report_DDMMMYYYY_HHMMSS.json")
+_QC_FILENAME_LENGTHS = frozenset({_QC_FILENAME_DATE_ONLY_LEN, _QC_FILENAME_WITH_TIME_LEN})
+# Strict, anchored filename filter: fixed-width fields leave no room for backtracking on near-misses.
+# The month is validated separately against _MONTHS_TABLE.
+_QC_FILENAME_RE = re.compile(
+    r"\AQC_Status_Report_[0-3][0-9][A-Z]{3}[12][0-9]{3}(?:_[0-2][0-9][0-5][0-9][0-5][0-9])?\.json\Z"
+)
+# Fixed field positions within a name that passed the filter
+_DAY = slice(17, 19)
+_MONTH = slice(19, 22)
+_YEAR = slice(22, 26)
+_HOUR = slice(27, 29)
+_MINUTE = slice(29, 31)
+_SECOND = slice(31, 33)
+# Month codes packed three characters apart: a single find() gives the month index
+_MONTHS_TABLE = "JANFEBMARAPRMAYJUNJULAUGSEPOCTNOVDEC"
+# Month abbreviations for output directory stamps (same as %b in the C locale)
+_MONTH_ABBR = ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+
 
 def find_latest_qc_status_file(upload_path: Path) -> Optional[Path]:
     """
@@ -36,49 +59,64 @@ def find_latest_qc_status_file(upload_path: Path) -> Optional[Path]:
     Expected pattern: QC_Status_Report_{DDMMMYYYY}_{HHMMSS}.json
     Falls back to QC_Status_Report_{DDMMMYYYY}.json if no timestamp format found.
 
+    Names that do not match the pattern exactly (case, month abbreviation, field widths) or that
+    encode an impossible date or time are ignored.
+
     Returns the file with the latest timestamp based on filename, not file system dates.
     """
-    pattern_with_time = re.compile(r"^QC_Status_Report_(\d{2}[A-Z]{3}\d{4})_(\d{6})\.json$", re.IGNORECASE)
-    pattern_date_only = re.compile(r"^QC_Status_Report_(\d{2}[A-Z]{3}\d{4})\.json$", re.IGNORECASE)
+    latest = max(_iter_qc_status_files(upload_path), key=lambda candidate: candidate[0], default=None)
+    return latest[1] if latest else None
 
-    qc_files = []
 
+def _iter_qc_status_files(upload_path: Path) -> Iterator[tuple[datetime, Path]]:
+    """Yield (timestamp, path) for every valid QC Status Report file in the directory."""
     for file in upload_path.glob("QC_Status_Report_*.json"):
-        match_with_time = pattern_with_time.match(file.name)
-        match_date_only = pattern_date_only.match(file.name)
-
-        if match_with_time:
-            date_str, time_str = match_with_time.groups()
-            try:
-                file_datetime = dt.strptime(f"{date_str}_{time_str}", "%d%b%Y_%H%M%S")
-                qc_files.append((file_datetime, file))
-            except ValueError:
-                qc_files.append((dt.fromtimestamp(file.stat().st_mtime), file))
-        elif match_date_only:
-            date_str = match_date_only.group(1)
-            try:
-                file_datetime = dt.strptime(date_str, "%d%b%Y")
-                qc_files.append((file_datetime, file))
-            except ValueError:
-                qc_files.append((dt.fromtimestamp(file.stat().st_mtime), file))
-
-    if not qc_files:
-        return None
-
-    qc_files.sort(key=lambda x: x[0], reverse=True)
-    return qc_files[0][1]
-
-
-def create_output_directory(output_dir: Optional[Path] = None, test_run: bool = False) -> Path:
-    """Create output directory for the upload process."""
+        name = file.name
+        if (
+            len(name) not in _QC_FILENAME_LENGTHS
+            or not name.startswith(_QC_FILENAME_PREFIX)
+            or not name.endswith(_QC_FILENAME_SUFFIX)
+        ):
+            continue
+
+        if not _QC_FILENAME_RE.match(name):
+            continue
+
+        month_index = _MONTHS_TABLE.find(name[_MONTH])
+        if month_index < 0 or month_index % 3:
+            continue
+
+        try:
+            if len(name) == _QC_FILENAME_WITH_TIME_LEN:
+                time_parts = (int(name[_HOUR]), int(name[_MINUTE]), int(name[_SECOND]))
+            else:
+                time_parts = (0, 0, 0)
+            timestamp = dt(int(name[_YEAR]), month_index // 3 + 1, int(name[_DAY]), *time_parts)
+        except ValueError:
+            # Well-formed name but impossible calendar date or time (e.g. 32AUG2025, 00JAN2025)
+            continue
+        yield timestamp, file
+
+
+def create_output_directory(
+    output_dir: Optional[Path] = None,
+    test_run: bool = False,
+    *,
+    path_factory: Callable[..., Path] = Path,
+    now: Callable[[], datetime] = datetime.now,
+) -> Path:
+    """Create output directory for the upload process.
+
+    ``path_factory`` and ``now`` can be injected to control path construction and the timestamp.
+    """
     if output_dir:
-        output_dir = Path(output_dir)
+        output_dir = path_factory(output_dir)
     else:
-        date_part = datetime.now().strftime("%d%b%Y")
-        time_part = datetime.now().strftime("%H%M%S")
+        n = now()
+        stamp = f"{n.day:02d}{_MONTH_ABBR[n.month - 1]}{n.year}_{n.hour:02d}{n.minute:02d}{n.second:02d}"
         prefix = "TEST_" if test_run else ""
-        dir_name = f"{prefix}REDCAP_Uploader_{date_part}_{time_part}"
-        output_dir = Path("./output") / dir_name
+        dir_name = f"{prefix}REDCAP_Uploader_{stamp}"
+        output_dir = path_factory("./output") / dir_name
 
     output_dir.mkdir(parents=True, exist_ok=True)
     return output_dir
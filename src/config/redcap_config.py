@@ -10,7 +10,7 @@ from dotenv import load_dotenv
 load_dotenv()
 
 
-@dataclass
+@dataclass(slots=True)
 class REDCapConfig:
     """REDCap API configuration."""
 
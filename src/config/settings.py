@@ -3,7 +3,7 @@
 import os
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List
+from typing import List, Set
 
 from dotenv import load_dotenv
 
@@ -11,7 +11,7 @@ from dotenv import load_dotenv
 load_dotenv()
 
 
-@dataclass
+@dataclass(slots=True)
 class Settings:
     """Main application settings."""
 
@@ -34,12 +34,13 @@ class Settings:
     LOG_TO_FILE: bool = True
     LOG_TO_CONSOLE: bool = True
 
-    # Directories
+    # Directories (DATA_DIR, LOGS_DIR, BACKUPS_DIR and OUTPUT_DIR are exposed as properties below)
     BASE_DIR: Path = field(default_factory=lambda: Path(__file__).parent.parent.parent)
-    DATA_DIR: Path = field(init=False)
-    LOGS_DIR: Path = field(init=False)
-    BACKUPS_DIR: Path = field(init=False)
-    OUTPUT_DIR: Path = field(init=False)
+    _data_dir: Path = field(init=False, repr=False, compare=False)
+    _logs_dir: Path = field(init=False, repr=False, compare=False)
+    _backups_dir: Path = field(init=False, repr=False, compare=False)
+    _output_dir: Path = field(init=False, repr=False, compare=False)
+    _created_dirs: Set[Path] = field(default_factory=set, init=False, repr=False, compare=False)
 
     # Upload paths
     UPLOAD_READY_PATH: str = field(default_factory=lambda: os.getenv("UPLOAD_READY_PATH", "./data"))
@@ -61,14 +62,38 @@ class Settings:
     def __post_init__(self):
         """Initialize computed fields."""
         # Use environment variables if available, otherwise use BASE_DIR
-        self.DATA_DIR = Path(os.getenv("DATA_DIR", self.BASE_DIR / "data"))
-        self.LOGS_DIR = Path(os.getenv("LOG_PATH", self.BASE_DIR / "logs"))
-        self.BACKUPS_DIR = Path(self.BACKUP_LOG_PATH)
-        self.OUTPUT_DIR = Path(os.getenv("OUTPUT_DIR", self.BASE_DIR / "output"))
-
-        # Create directories if they don't exist
-        for directory in [self.DATA_DIR, self.LOGS_DIR, self.BACKUPS_DIR, self.OUTPUT_DIR]:
+        self._data_dir = Path(os.getenv("DATA_DIR", self.BASE_DIR / "data"))
+        self._logs_dir = Path(os.getenv("LOG_PATH", self.BASE_DIR / "logs"))
+        self._backups_dir = Path(self.BACKUP_LOG_PATH)
+        self._output_dir = Path(os.getenv("OUTPUT_DIR", self.BASE_DIR / "output"))
+
+    # Paths are fixed at construction; each directory is created on first access.
+    @property
+    def DATA_DIR(self) -> Path:
+        """Data directory."""
+        return self._ensure_dir(self._data_dir)
+
+    @property
+    def LOGS_DIR(self) -> Path:
+        """Log directory."""
+        return self._ensure_dir(self._logs_dir)
+
+    @property
+    def BACKUPS_DIR(self) -> Path:
+        """Backup directory."""
+        return self._ensure_dir(self._backups_dir)
+
+    @property
+    def OUTPUT_DIR(self) -> Path:
+        """Output directory."""
+        return self._ensure_dir(self._output_dir)
+
+    def _ensure_dir(self, directory: Path) -> Path:
+        """Create the directory the first time it is requested and return it."""
+        if directory not in self._created_dirs:
             directory.mkdir(parents=True, exist_ok=True)
+            self._created_dirs.add(directory)
+        return directory
 
     @classmethod
     def from_env(cls) -> "Settings":
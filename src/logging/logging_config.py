@@ -19,6 +19,9 @@ import sys
 from pathlib import Path
 from typing import ClassVar
 
+# Arguments of the most recent setup_logging() call, used to skip redundant reconfiguration
+_active_config: tuple | None = None
+
 
 class ColoredFormatter(logging.Formatter):
     """Custom formatter with color support for terminal output."""
@@ -120,7 +123,22 @@ def setup_logging(
         performance_tracking: Enable performance metrics
         max_file_size: Maximum size for log files before rotation
         backup_count: Number of backup log files to keep
+
+    Calling this again with the same arguments is a no-op while the handlers are still installed.
     """
+    global _active_config
+
+    config_key = (
+        log_level.upper(),
+        str(log_file) if log_file else None,
+        console_output,
+        structured_logging,
+        performance_tracking,
+        max_file_size,
+        backup_count,
+    )
+    if config_key == _active_config and logging.getLogger("uploader").handlers:
+        return
 
     # Convert log level string to logging constant
     numeric_level = getattr(logging, log_level.upper(), logging.INFO)
@@ -227,6 +245,7 @@ def setup_logging(
 
     # Apply configuration
     logging.config.dictConfig(logging_config)
+    _active_config = config_key
 
 
 def get_logger(name: str) -> logging.Logger:
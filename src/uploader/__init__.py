@@ -4,6 +4,6 @@ from .change_tracker import ChangeTracker
 from .data_processor import DataProcessor
 from .fetcher import REDCapFetcher
 from .file_monitor import FileMonitor
-from .uploader import QCDataUploader
+from .uploader import QCDataUploader, UploadReceipt
 
-__all__ = ["FileMonitor", "DataProcessor", "ChangeTracker", "QCDataUploader", "REDCapFetcher"]
+__all__ = ["FileMonitor", "DataProcessor", "ChangeTracker", "QCDataUploader", "REDCapFetcher", "UploadReceipt"]
@@ -2,7 +2,7 @@
 
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import IO, Any, Dict, List, Optional, Union, cast
 
 import numpy as np
 import pandas as pd
@@ -20,30 +20,44 @@ class DataProcessor:
         self.validation_errors: List[str] = []
         self.validation_warnings: List[str] = []
 
-    def load_file(self, file_path: Path) -> pd.DataFrame:
-        """Load data from Excel or CSV file."""
-        file_path = Path(file_path)
+    def load_file(self, file_path: Union[Path, str, IO], file_type: Optional[str] = None) -> pd.DataFrame:
+        """Load data from Excel or CSV file.
 
-        if not file_path.exists():
-            raise FileNotFoundError(f"File not found: {file_path}")
+        ``file_path`` may also be an open file-like object (e.g. ``io.StringIO``). Its type is then
+        taken from ``file_type`` (such as ``".csv"``) or from the object's ``name`` attribute.
+        """
+        source: Union[Path, IO]
+        if hasattr(file_path, "read"):
+            source = cast(IO, file_path)
+            label = str(getattr(source, "name", "<buffer>"))
+        else:
+            source = Path(cast(Union[Path, str], file_path))
+            label = str(source)
+
+            if not source.exists():
+                raise FileNotFoundError(f"File not found: {source}")
+
+        suffix = (file_type or Path(label).suffix).lower()
+        if suffix and not suffix.startswith("."):
+            suffix = f".{suffix}"
 
         try:
             # Determine file type and load accordingly
-            if file_path.suffix.lower() in [".xlsx", ".xls"]:
-                df = self._load_excel(file_path)
-            elif file_path.suffix.lower() == ".csv":
-                df = self._load_csv(file_path)
+            if suffix in [".xlsx", ".xls"]:
+                df = self._load_excel(source)
+            elif suffix == ".csv":
+                df = self._load_csv(source)
             else:
-                raise ValueError(f"Unsupported file type: {file_path.suffix}")
+                raise ValueError(f"Unsupported file type: {suffix}")
 
-            logger.info(f"Loaded {len(df)} rows from {file_path}")
+            logger.info(f"Loaded {len(df)} rows from {label}")
             return df
 
         except Exception as e:
-            logger.error(f"Error loading file {file_path}: {e}")
+            logger.error(f"Error loading file {label}: {e}")
             raise
 
-    def _load_excel(self, file_path: Path) -> pd.DataFrame:
+    def _load_excel(self, file_path: Union[Path, IO]) -> pd.DataFrame:
         """Load Excel file with error handling."""
         try:
             # Try to load the first sheet
@@ -54,13 +68,16 @@ class DataProcessor:
             logger.error(f"Error reading Excel file: {e}")
             raise
 
-    def _load_csv(self, file_path: Path) -> pd.DataFrame:
+    def _load_csv(self, file_path: Union[Path, IO]) -> pd.DataFrame:
         """Load CSV file with error handling."""
         try:
             # Try different encodings
             encodings = ["utf-8", "utf-8-sig", "latin1", "cp1252"]
 
             for encoding in encodings:
+                # Rewind buffers left part-way through by a failed decode attempt
+                if hasattr(file_path, "seek"):
+                    file_path.seek(0)
                 try:
                     df = pd.read_csv(file_path, encoding=encoding)
                     logger.debug(f"Loaded CSV file with encoding {encoding}: {len(df)} rows, {len(df.columns)} columns")
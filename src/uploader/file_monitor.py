@@ -5,7 +5,7 @@ import json
 from dataclasses import asdict, dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 from ..logging.logging_config import get_logger
 
@@ -81,13 +81,8 @@ class FileMonitor:
     def get_file_hash(self, file_path: Path, algorithm: str = "sha256") -> str:
         """Calculate file hash."""
         try:
-            hash_obj = hashlib.new(algorithm)
-
             with open(file_path, "rb") as f:
-                for chunk in iter(lambda: f.read(4096), b""):
-                    hash_obj.update(chunk)
-
-            return hash_obj.hexdigest()
+                return hashlib.file_digest(f, algorithm).hexdigest()
 
         except Exception as e:
             self.logger.error(f"Error calculating hash for {file_path}: {e}")
@@ -119,22 +114,24 @@ class FileMonitor:
             self.logger.error(f"Error checking file changes for {file_path}: {e}")
             return True  # Assume changed if we can't determine
 
+    def _record_file(self, file_path: Path, records_count: int) -> None:
+        """Add or replace the history entry for a file without saving."""
+        file_stats = file_path.stat()
+        file_path_str = str(file_path)
+
+        self._file_history[file_path_str] = FileInfo(
+            path=file_path_str,
+            hash=self.get_file_hash(file_path),
+            size=file_stats.st_size,
+            modified_time=file_stats.st_mtime,
+            processed_time=datetime.now().isoformat(),
+            records_count=records_count,
+        )
+
     def mark_file_processed(self, file_path: Path, records_count: int = 0) -> None:
         """Mark file as processed."""
         try:
-            file_stats = file_path.stat()
-            file_hash = self.get_file_hash(file_path)
-
-            file_info = FileInfo(
-                path=str(file_path),
-                hash=file_hash,
-                size=file_stats.st_size,
-                modified_time=file_stats.st_mtime,
-                processed_time=datetime.now().isoformat(),
-                records_count=records_count,
-            )
-
-            self._file_history[str(file_path)] = file_info
+            self._record_file(file_path, records_count)
             self._save_history()
 
             self.logger.info(f"Marked file as processed: {file_path.name}")
@@ -142,6 +139,26 @@ class FileMonitor:
         except Exception as e:
             self.logger.error(f"Error marking file as processed {file_path}: {e}")
 
+    def mark_files_processed_bulk(self, file_paths: List[Path], counts: Optional[List[int]] = None) -> None:
+        """Mark several files as processed, writing the tracking file once."""
+        if counts is None:
+            counts = [0] * len(file_paths)
+        elif len(counts) != len(file_paths):
+            raise ValueError(f"Got {len(counts)} record counts for {len(file_paths)} files")
+
+        marked = 0
+        for file_path, records_count in zip(file_paths, counts):
+            try:
+                self._record_file(file_path, records_count)
+                marked += 1
+            except Exception as e:
+                self.logger.error(f"Error marking file as processed {file_path}: {e}")
+
+        if marked:
+            self._save_history()
+
+        self.logger.info(f"Marked {marked}/{len(file_paths)} files as processed")
+
     def get_file_status(self) -> List[Dict[str, Any]]:
         """Get status of all files in the watch directory."""
         status_list: List[Dict[str, Any]] = []
@@ -155,23 +172,22 @@ class FileMonitor:
             for file_path in self.watch_directory.rglob("*"):
                 if file_path.is_file() and not file_path.name.startswith("."):
                     try:
+                        file_path_str = str(file_path)
                         stats = file_path.stat()
                         is_changed = self.has_file_changed(file_path)
+                        history = self._file_history.get(file_path_str)
 
                         file_status = {
                             "file": file_path.name,
-                            "path": str(file_path),
+                            "path": file_path_str,
                             "size": stats.st_size,
                             "last_modified": datetime.fromtimestamp(stats.st_mtime).isoformat(),
                             "status": "CHANGED" if is_changed else "PROCESSED",
-                            "hash": self.get_file_hash(file_path)
-                            if is_changed
-                            else self._file_history.get(str(file_path), FileInfo("", "", 0, 0, "")).hash,
+                            "hash": self.get_file_hash(file_path) if is_changed or history is None else history.hash,
                         }
 
                         # Add processing history if available
-                        if str(file_path) in self._file_history:
-                            history = self._file_history[str(file_path)]
+                        if history is not None:
                             file_status.update(
                                 {"last_processed": history.processed_time, "records_processed": history.records_count}
                             )
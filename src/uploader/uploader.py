@@ -1,10 +1,12 @@
 """Data upload functionality for REDCap."""
 
 import json
+from dataclasses import asdict, dataclass
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+import orjson
 import pandas as pd
 import requests
 
@@ -19,9 +21,35 @@ from .file_monitor import FileMonitor
 logger = get_logger("uploader")
 
 
+def _write_json_artifact(path: Path, data: Any) -> None:
+    """Write a pretty-printed UTF-8 JSON output file in a single write."""
+    # Non-string keys (e.g. numeric Excel headers) and numpy scalars serialize as json.dump would handle them
+    options = orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+    path.write_bytes(orjson.dumps(data, option=options))
+
+
+@dataclass(frozen=True, slots=True)
+class UploadReceipt:
+    """Outcome of a single REDCap import request."""
+
+    success: bool
+    records_imported: int = 0
+    redcap_response: Any = None
+    total_sent: int = 0
+    error: Optional[str] = None
+    error_type: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary."""
+        return asdict(self)
+
+
 class QCDataUploader:
     """Main uploader class for handling QC Status and Query Resolution uploads."""
 
+    # Fields every QC Status record must carry with a non-empty value
+    _REQUIRED_QC_FIELDS = ("ptid", "qc_last_run")
+
     def __init__(self, config: REDCapConfig, settings: Settings):
         self.config = config
         self.settings = settings
@@ -159,24 +187,22 @@ class QCDataUploader:
             if not dry_run:
                 upload_result = self._upload_to_redcap(upload_data_with_audit)
 
-                if upload_result["success"]:
+                if upload_result.success:
                     # Create upload receipt
                     receipt_data = {
                         "upload_timestamp": datetime.now().isoformat(),
                         "user_initials": initials,
                         "records_uploaded": len(upload_data_with_audit),
                         "files_processed": [f.name for f in json_files],
-                        "upload_result": upload_result,
+                        "upload_result": upload_result.to_dict(),
                     }
 
                     receipt_file = output_dir / f"DataUploaded_Recipt_{datetime.now().strftime('%d%b%Y_%H%M%S')}.json"
-                    with open(receipt_file, "w", encoding="utf-8") as f:
-                        json.dump(receipt_data, f, indent=2, ensure_ascii=False)
+                    _write_json_artifact(receipt_file, receipt_data)
 
                     # Save uploaded data to file for reference
                     uploaded_data_file = output_dir / f"DataUploaded_{datetime.now().strftime('%d%b%Y_%H%M%S')}.json"
-                    with open(uploaded_data_file, "w", encoding="utf-8") as f:
-                        json.dump(upload_data_with_audit, f, indent=2, ensure_ascii=False)
+                    _write_json_artifact(uploaded_data_file, upload_data_with_audit)
 
                     # Update tracking
                     self._track_upload(
@@ -197,7 +223,9 @@ class QCDataUploader:
                         "backup_data": backup_data,
                     }
                 else:
-                    return {"success": False, "error": upload_result["error"], "output_directory": str(output_dir)}
+                    return self._upload_failure_result(
+                        "qc_status", upload_result, [str(f) for f in json_files], initials, output_dir
+                    )
             else:
                 self.logger.info(f"DRY RUN: Would upload {len(upload_data_with_audit)} records")
                 return {
@@ -257,26 +285,24 @@ class QCDataUploader:
             # Create fallback file
             fallback_data = self._create_backup_data(current_data, upload_data)
             fallback_file = output_dir / f"FALLBACK_FILE_{datetime.now().strftime('%d%b%Y_%H%M%S')}.json"
-            with open(fallback_file, "w", encoding="utf-8") as f:
-                json.dump(fallback_data, f, indent=2, ensure_ascii=False)
+            _write_json_artifact(fallback_file, fallback_data)
 
             # Perform upload (if not dry run)
             if not dry_run:
                 upload_result = self._upload_to_redcap(upload_data)
 
-                if upload_result["success"]:
+                if upload_result.success:
                     # Create upload receipt
                     receipt_data = {
                         "upload_timestamp": datetime.now().isoformat(),
                         "user_initials": initials,
                         "records_uploaded": len(upload_data),
                         "source_file": str(data_file),
-                        "upload_result": upload_result,
+                        "upload_result": upload_result.to_dict(),
                     }
 
                     receipt_file = output_dir / f"DATA_UPLOAD_RECEIPT_{datetime.now().strftime('%d%b%Y_%H%M%S')}.json"
-                    with open(receipt_file, "w", encoding="utf-8") as f:
-                        json.dump(receipt_data, f, indent=2, ensure_ascii=False)
+                    _write_json_artifact(receipt_file, receipt_data)
 
                     # Update tracking
                     self._track_upload(
@@ -296,7 +322,9 @@ class QCDataUploader:
                         "receipt_file": str(receipt_file),
                     }
                 else:
-                    return {"success": False, "error": upload_result["error"], "output_directory": str(output_dir)}
+                    return self._upload_failure_result(
+                        "query_resolution", upload_result, [str(data_file)], initials, output_dir
+                    )
             else:
                 self.logger.info(f"DRY RUN: Would upload {len(upload_data)} records")
                 return {
@@ -422,15 +450,12 @@ class QCDataUploader:
         """Validate QC Status data structure and content."""
         try:
             validation_errors = []
-            required_fields = ["ptid", "qc_last_run"]
 
             for i, record in enumerate(data):
-                record_errors = []
-
-                # Check required fields
-                for field in required_fields:
-                    if field not in record or not record[field]:
-                        record_errors.append(f"Missing required field: {field}")
+                # Check required fields (absent and empty values both count as missing)
+                record_errors = [
+                    f"Missing required field: {field}" for field in self._REQUIRED_QC_FIELDS if not record.get(field)
+                ]
 
                 if record_errors:
                     validation_errors.append(
@@ -566,9 +591,49 @@ class QCDataUploader:
         self.logger.info(f"Filtered {len(new_data)} records down to {len(new_records)} new records")
         return new_records
 
-    def _upload_to_redcap(self, data: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _upload_to_redcap(self, data: List[Dict[str, Any]]) -> UploadReceipt:
+        """
+        Upload data to REDCap in chunks of settings.BATCH_SIZE records.
+
+        Each chunk is a separate import request on the shared keep-alive session. Counts and
+        responses are aggregated across chunks; the first failing chunk stops the upload and the
+        returned receipt reports how many records earlier chunks had already imported.
+        """
+        chunk_size = max(1, int(self.settings.BATCH_SIZE))
+        records_imported = 0
+        total_sent = 0
+        responses: List[Any] = []
+
+        for start in range(0, len(data), chunk_size):
+            chunk = data[start : start + chunk_size]
+            receipt = self._import_chunk(chunk)
+
+            if not receipt.success:
+                if records_imported:
+                    self.logger.warning(
+                        f"Upload stopped after {records_imported} of {len(data)} records were already imported"
+                    )
+                return UploadReceipt(
+                    success=False,
+                    records_imported=records_imported,
+                    redcap_response=responses + [receipt.redcap_response],
+                    total_sent=total_sent,
+                    error=receipt.error,
+                    error_type=receipt.error_type,
+                )
+
+            records_imported += receipt.records_imported
+            total_sent += receipt.total_sent
+            responses.append(receipt.redcap_response)
+
+        self.logger.info(f"Upload finished: {records_imported} of {len(data)} records imported")
+        return UploadReceipt(
+            success=True, records_imported=records_imported, redcap_response=responses, total_sent=total_sent
+        )
+
+    def _import_chunk(self, data: List[Dict[str, Any]]) -> UploadReceipt:
         """
-        Upload data to REDCap via API using import specification from REDCAP_IMPORT_EXPORT.md.
+        Upload one chunk of records to REDCap via API using import specification from REDCAP_IMPORT_EXPORT.md.
 
         Following the REDCap API Import Records specification:
         - content: record
@@ -616,12 +681,9 @@ class QCDataUploader:
 
                 self.logger.info(f"Upload completed successfully: {imported_count} records imported")
 
-                return {
-                    "success": True,
-                    "records_imported": imported_count,
-                    "redcap_response": result,
-                    "total_sent": len(data),
-                }
+                return UploadReceipt(
+                    success=True, records_imported=imported_count, redcap_response=result, total_sent=len(data)
+                )
 
             except (json.JSONDecodeError, ValueError):
                 # Handle non-JSON response
@@ -632,37 +694,72 @@ class QCDataUploader:
                 if response_text.isdigit():
                     imported_count = int(response_text)
                     self.logger.info(f"Upload completed: {imported_count} records imported")
-                    return {
-                        "success": True,
-                        "records_imported": imported_count,
-                        "redcap_response": response_text,
-                        "total_sent": len(data),
-                    }
+                    return UploadReceipt(
+                        success=True,
+                        records_imported=imported_count,
+                        redcap_response=response_text,
+                        total_sent=len(data),
+                    )
                 else:
-                    return {
-                        "success": False,
-                        "error": f"Could not parse REDCap response: {response_text}",
-                        "response_text": response_text,
-                    }
+                    return UploadReceipt(
+                        success=False,
+                        error=f"Could not parse REDCap response: {response_text}",
+                        redcap_response=response_text,
+                    )
 
         except requests.exceptions.Timeout as e:
             error_msg = f"REDCap API request timed out after {self.config.timeout} seconds: {str(e)}"
             self.logger.error(error_msg)
-            return {"success": False, "error": error_msg, "error_type": "timeout"}
+            return UploadReceipt(success=False, error=error_msg, error_type="timeout")
 
         except requests.exceptions.RequestException as e:
             error_msg = f"REDCap API request failed: {str(e)}"
             if hasattr(e, "response") and e.response is not None:
                 error_msg += f" Response: {e.response.text}"
             self.logger.error(error_msg)
-            return {"success": False, "error": error_msg, "error_type": "request_failed"}
+            return UploadReceipt(success=False, error=error_msg, error_type="request_failed")
 
         except Exception as e:
             error_msg = f"Unexpected error during upload: {str(e)}"
             self.logger.error(error_msg)
-            return {"success": False, "error": error_msg, "error_type": "unexpected"}
+            return UploadReceipt(success=False, error=error_msg, error_type="unexpected")
 
-    def _track_upload(self, upload_type: str, file_paths: List[str], initials: str, records_count: int) -> None:
+    def _upload_failure_result(
+        self, upload_type: str, upload_result: UploadReceipt, file_paths: List[str], initials: str, output_dir: Path
+    ) -> Dict[str, Any]:
+        """Build the result for a failed upload, recording any chunks REDCap had already imported."""
+        result: Dict[str, Any] = {"success": False, "error": upload_result.error, "output_directory": str(output_dir)}
+
+        if upload_result.records_imported:
+            # Earlier chunks are in REDCap even though the upload failed; keep an audit trace of them
+            receipt_data = {
+                "upload_timestamp": datetime.now().isoformat(),
+                "user_initials": initials,
+                "records_uploaded": upload_result.records_imported,
+                "files_processed": [Path(f).name for f in file_paths],
+                "partial": True,
+                "upload_result": upload_result.to_dict(),
+            }
+            receipt_file = output_dir / f"PARTIAL_UPLOAD_RECEIPT_{datetime.now().strftime('%d%b%Y_%H%M%S')}.json"
+            _write_json_artifact(receipt_file, receipt_data)
+
+            self._track_upload(
+                upload_type=upload_type,
+                file_paths=file_paths,
+                initials=initials,
+                records_count=upload_result.records_imported,
+                partial=True,
+            )
+
+            result.update(
+                {"records_imported": upload_result.records_imported, "partial": True, "receipt_file": str(receipt_file)}
+            )
+
+        return result
+
+    def _track_upload(
+        self, upload_type: str, file_paths: List[str], initials: str, records_count: int, partial: bool = False
+    ) -> None:
         """Track upload in comprehensive log."""
         try:
             # Create tracking entry
@@ -672,6 +769,7 @@ class QCDataUploader:
                 "file_paths": file_paths,
                 "user_initials": initials,
                 "records_count": records_count,
+                "partial": partial,
             }
 
             # Write to comprehensive log
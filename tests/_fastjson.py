@@ -0,0 +1,8 @@
+"""Fast JSON serialization helpers for writing test fixture files."""
+
+import orjson
+
+
+def dump_bytes(obj) -> bytes:
+    """Serialize obj to UTF-8 JSON bytes with orjson."""
+    return orjson.dumps(obj)
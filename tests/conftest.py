@@ -3,30 +3,70 @@
 import json
 import logging
 import os
-import tempfile
-from datetime import datetime
+import shutil
 from pathlib import Path
-from typing import Dict, List, Any
-from unittest.mock import Mock, MagicMock
-import pytest
-import sys
+from types import MappingProxyType
+from unittest.mock import Mock
 
-# Add the project root to the path
-project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root))
+import numpy as np
+import pandas as pd
+import pytest
 
 from src.config.redcap_config import REDCapConfig
 from src.config.settings import Settings
+from src.uploader.uploader import QCDataUploader, UploadReceipt
+from tests._fastjson import dump_bytes
+
+SAMPLE_QC_RECORDS = tuple(MappingProxyType(record) for record in [
+    {
+        "record_id": "UDS001",
+        "redcap_event_name": "baseline_arm_1",
+        "ptid": "UDS001",
+        "qc_status_complete": "2",
+        "qc_visit_date": "2025-08-15",
+        "qc_last_run": "15AUG2025",
+        "qc_notes": "Initial QC check completed",
+        "qc_status": "1",
+        "qc_results": "All checks passed",
+        "qc_run_by": "JT",
+        "quality_control_check_complete": "2"
+    },
+    {
+        "record_id": "UDS002",
+        "redcap_event_name": "baseline_arm_1",
+        "ptid": "UDS002",
+        "qc_status_complete": "2",
+        "qc_visit_date": "2025-08-16",
+        "qc_last_run": "16AUG2025",
+        "qc_notes": "Second QC check",
+        "qc_status": "2",
+        "qc_results": "Minor issues found, corrected",
+        "qc_run_by": "JT",
+        "quality_control_check_complete": "2"
+    },
+    {
+        "record_id": "UDS003",
+        "redcap_event_name": "followup_1_arm_1",
+        "ptid": "UDS003",
+        "qc_status_complete": "1",
+        "qc_visit_date": "2025-08-17",
+        "qc_last_run": "17AUG2025",
+        "qc_notes": "Follow-up QC",
+        "qc_status": "1",
+        "qc_results": "",
+        "qc_run_by": "JT",
+        "quality_control_check_complete": "1"
+    }
+])
 
 
 @pytest.fixture
-def temp_dir():
+def temp_dir(tmp_path):
     """Create a temporary directory for test files."""
-    with tempfile.TemporaryDirectory() as tmp_dir:
-        yield Path(tmp_dir)
+    return tmp_path
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def test_logger():
     """Create a test logger."""
     logger = logging.getLogger("test_logger")
@@ -45,7 +85,7 @@ def test_logger():
     return logger
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_redcap_config():
     """Create a mock REDCap configuration."""
     config = Mock(spec=REDCapConfig)
@@ -86,50 +126,26 @@ def test_settings(temp_dir):
     return settings
 
 
+@pytest.fixture(scope="session")
+def sample_qc_records():
+    """Read-only sample QC status records shared across the session."""
+    return SAMPLE_QC_RECORDS
+
+
 @pytest.fixture
-def sample_qc_data():
+def sample_qc_data(sample_qc_records):
     """Create sample QC status data for testing."""
-    return [
-        {
-            "record_id": "UDS001",
-            "redcap_event_name": "baseline_arm_1",
-            "ptid": "UDS001",
-            "qc_status_complete": "2",
-            "qc_visit_date": "2025-08-15",
-            "qc_last_run": "15AUG2025",
-            "qc_notes": "Initial QC check completed",
-            "qc_status": "1",
-            "qc_results": "All checks passed",
-            "qc_run_by": "JT",
-            "quality_control_check_complete": "2"
-        },
-        {
-            "record_id": "UDS002",
-            "redcap_event_name": "baseline_arm_1",
-            "ptid": "UDS002",
-            "qc_status_complete": "2",
-            "qc_visit_date": "2025-08-16",
-            "qc_last_run": "16AUG2025",
-            "qc_notes": "Second QC check",
-            "qc_status": "2",
-            "qc_results": "Minor issues found, corrected",
-            "qc_run_by": "JT",
-            "quality_control_check_complete": "2"
-        },
-        {
-            "record_id": "UDS003",
-            "redcap_event_name": "followup_1_arm_1",
-            "ptid": "UDS003",
-            "qc_status_complete": "1",
-            "qc_visit_date": "2025-08-17",
-            "qc_last_run": "17AUG2025",
-            "qc_notes": "Follow-up QC",
-            "qc_status": "1",
-            "qc_results": "",
-            "qc_run_by": "JT",
-            "quality_control_check_complete": "1"
-        }
-    ]
+    return [dict(record) for record in sample_qc_records]
+
+
+@pytest.fixture
+def canonical_record():
+    """Minimal REDCap identity + qc_last_run for the first sample record."""
+    return {
+        "record_id": "UDS001",
+        "redcap_event_name": "baseline_arm_1",
+        "qc_last_run": "15AUG2025"
+    }
 
 
 @pytest.fixture
@@ -168,6 +184,107 @@ def old_qc_file(temp_dir):
     return file_path
 
 
+@pytest.fixture(scope="session")
+def shared_tmp(tmp_path_factory):
+    """Session-wide directory for read-only generated test files."""
+    return tmp_path_factory.mktemp("shared")
+
+
+@pytest.fixture(scope="session")
+def large_qc_blob():
+    """Serialized 1000-record QC dataset, built once per session."""
+    ids = np.char.add("UDS", np.char.zfill(np.arange(1000).astype("U4"), 4)).tolist()
+    return dump_bytes([
+        {
+            "record_id": record_id,
+            "redcap_event_name": "baseline_arm_1",
+            "ptid": record_id,
+            "qc_status": "1"
+        }
+        for record_id in ids
+    ])
+
+
+@pytest.fixture(scope="session")
+def large_qc_dataset():
+    """500 complete QC upload records, built once per session."""
+    return [
+        {
+            "record_id": f"UDS{i:04d}",
+            "redcap_event_name": "baseline_arm_1",
+            "ptid": f"UDS{i:04d}",
+            "qc_status": "1",
+            "qc_last_run": "15AUG2025",
+            "qc_results": f"Results for record {i}",
+            "qc_run_by": "JT"
+        }
+        for i in range(500)
+    ]
+
+
+@pytest.fixture(scope="session")
+def large_qc_file(tmp_path_factory, large_qc_dataset):
+    """Compact JSON file of the large QC dataset, written once per session."""
+    file_path = tmp_path_factory.mktemp("large") / "QC_Status_Report_large.json"
+    file_path.write_bytes(dump_bytes(large_qc_dataset))
+    
+    return file_path
+
+
+@pytest.fixture(scope="session")
+def seed_dir(tmp_path_factory, large_qc_blob):
+    """Pre-seeded directory of read-only fixture files to link into tests."""
+    seed = tmp_path_factory.mktemp("seed")
+    (seed / "large_dataset.json").write_bytes(large_qc_blob)
+    return seed
+
+
+@pytest.fixture
+def link_seed(seed_dir):
+    """Hard-link a seeded file to a test path, copying if linking is not possible."""
+    def _link(name: str, target: Path) -> Path:
+        target.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            os.link(seed_dir / name, target)
+        except OSError:
+            shutil.copyfile(seed_dir / name, target)
+        return target
+    
+    return _link
+
+
+@pytest.fixture(scope="session")
+def sample_excel(shared_tmp):
+    """Create a sample Excel file once per session."""
+    file_path = shared_tmp / "test_data.xlsx"
+    pd.DataFrame({
+        'record_id': ['UDS001', 'UDS002', 'UDS003'],
+        'ptid': ['UDS001', 'UDS002', 'UDS003'],
+        'qc_status': [1, 2, 1],
+        'qc_results': ['Pass', 'Fail', 'Pass']
+    }).to_excel(file_path, index=False)
+    
+    return file_path
+
+
+@pytest.fixture(scope="session")
+def multi_sheet_excel(shared_tmp):
+    """Create an Excel workbook with two sheets once per session."""
+    file_path = shared_tmp / "multi_sheet.xlsx"
+    
+    with pd.ExcelWriter(file_path) as writer:
+        pd.DataFrame({
+            'record_id': ['UDS001', 'UDS002'],
+            'data': ['A', 'B']
+        }).to_excel(writer, sheet_name='Sheet1', index=False)
+        pd.DataFrame({
+            'record_id': ['UDS003', 'UDS004'],
+            'data': ['C', 'D']
+        }).to_excel(writer, sheet_name='Sheet2', index=False)
+    
+    return file_path
+
+
 @pytest.fixture
 def mock_requests_session():
     """Create a mock requests session for API testing."""
@@ -289,6 +406,25 @@ def setup_test_environment(monkeypatch):
         monkeypatch.setenv(key, value)
 
 
+@pytest.fixture(autouse=True)
+def fake_upload(request, monkeypatch):
+    """For tests marked no_http, replace _upload_to_redcap with a canned success receipt.
+
+    Returns the list of record batches passed to the fake so tests can assert on the upload.
+    """
+    if request.node.get_closest_marker("no_http") is None:
+        return None
+    
+    calls = []
+    
+    def _upload(self, data):
+        calls.append(data)
+        return UploadReceipt(success=True, records_imported=len(data), total_sent=len(data))
+    
+    monkeypatch.setattr(QCDataUploader, "_upload_to_redcap", _upload)
+    return calls
+
+
 class MockREDCapAPI:
     """Mock REDCap API for integration testing."""
     
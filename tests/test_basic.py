@@ -1,12 +1,5 @@
 """Simple test to validate test setup."""
 
-import sys
-from pathlib import Path
-
-# Add project root to path
-project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root))
-
 
 def test_basic_setup():
     """Test basic setup is working."""
@@ -1,17 +1,11 @@
 """Test suite for ChangeTracker functionality based on actual implementation."""
 
 import os
-import sys
 import json
 import pandas as pd
-from pathlib import Path
 from unittest.mock import Mock
 from datetime import datetime
 
-# Add the project root to the path
-project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root))
-
 from src.uploader.change_tracker import ChangeTracker, FieldChange, ChangeSet
 
 
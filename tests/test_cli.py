@@ -1,19 +1,47 @@
 """Test suite for CLI functionality."""
 
-import sys
-import json
+import logging
+import os
 import re
 from pathlib import Path
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import Mock
 from datetime import datetime
+from types import MappingProxyType
 
-# Add the project root to the path
-project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root))
+import pytest
 
+import src.cli.cli as cli_module
 from src.cli.cli import find_latest_qc_status_file, create_output_directory
 from src.logging.logging_config import setup_logging, get_logger
 
+# Canned, read-only component results shared by the integration tests
+_FETCH_RESULT = MappingProxyType({'success': True, 'record_count': 3, 'data': ()})
+_SAVE_RESULT = MappingProxyType({'success': True, 'file_path': "backup.json"})
+_UPLOAD_RESULT = MappingProxyType({'success': True, 'records_processed': 3})
+
+
+def _mk(path, names):
+    """Create empty fixture files; file contents are never read by the scanner."""
+    if os.open not in os.supports_dir_fd:
+        for name in names:
+            os.close(os.open(path / name, os.O_CREAT | os.O_WRONLY, 0o644))
+        return
+
+    dir_fd = os.open(path, os.O_RDONLY | getattr(os, "O_DIRECTORY", 0))
+    try:
+        for name in names:
+            os.close(os.open(name, os.O_CREAT | os.O_WRONLY, 0o644, dir_fd=dir_fd))
+    finally:
+        os.close(dir_fd)
+
+
+@pytest.fixture(scope="module")
+def upload_fixture(tmp_path_factory):
+    """Shared upload root for read-only scanner tests; each test uses its own subdirectory."""
+    path = tmp_path_factory.mktemp("qc") / "upload"
+    path.mkdir()
+    return path
+
 
 class TestFindLatestQCStatusFile:
     """Test find_latest_qc_status_file function."""
@@ -30,10 +58,7 @@ class TestFindLatestQCStatusFile:
             ("QC_Status_Report_14AUG2025_140000.json", "14AUG2025_140000"),
         ]
         
-        for filename, _ in files_data:
-            file_path = upload_path / filename
-            with open(file_path, 'w') as f:
-                json.dump([{"test": "data"}], f)
+        _mk(upload_path, [filename for filename, _ in files_data])
         
         latest_file = find_latest_qc_status_file(upload_path)
         
@@ -52,10 +77,7 @@ class TestFindLatestQCStatusFile:
             "QC_Status_Report_16AUG2025.json",
         ]
         
-        for filename in files_data:
-            file_path = upload_path / filename
-            with open(file_path, 'w') as f:
-                json.dump([{"test": "data"}], f)
+        _mk(upload_path, files_data)
         
         latest_file = find_latest_qc_status_file(upload_path)
         
@@ -75,10 +97,7 @@ class TestFindLatestQCStatusFile:
             "QC_Status_Report_16AUG2025_230000.json",  # Date with timestamp (same day, later time)
         ]
         
-        for filename in files_data:
-            file_path = upload_path / filename
-            with open(file_path, 'w') as f:
-                json.dump([{"test": "data"}], f)
+        _mk(upload_path, files_data)
         
         latest_file = find_latest_qc_status_file(upload_path)
         
@@ -101,14 +120,7 @@ class TestFindLatestQCStatusFile:
         upload_path.mkdir(parents=True, exist_ok=True)
         
         # Create file with invalid date format
-        invalid_file = upload_path / "QC_Status_Report_INVALID2025.json"
-        valid_file = upload_path / "QC_Status_Report_15AUG2025.json"
-        
-        with open(invalid_file, 'w') as f:
-            json.dump([{"test": "data"}], f)
-        
-        with open(valid_file, 'w') as f:
-            json.dump([{"test": "data"}], f)
+        _mk(upload_path, ["QC_Status_Report_INVALID2025.json", "QC_Status_Report_15AUG2025.json"])
         
         latest_file = find_latest_qc_status_file(upload_path)
         
@@ -129,25 +141,20 @@ class TestFindLatestQCStatusFile:
             "QC_Status_Report_15AUG2025.txt",  # Wrong extension
         ]
         
-        for filename in wrong_files:
-            file_path = upload_path / filename
-            with open(file_path, 'w') as f:
-                json.dump([{"test": "data"}], f)
+        _mk(upload_path, wrong_files)
         
         # Add one correct file
-        correct_file = upload_path / "QC_Status_Report_15AUG2025.json"
-        with open(correct_file, 'w') as f:
-            json.dump([{"test": "data"}], f)
+        _mk(upload_path, ["QC_Status_Report_15AUG2025.json"])
         
         latest_file = find_latest_qc_status_file(upload_path)
         
         assert latest_file is not None
         assert latest_file.name == "QC_Status_Report_15AUG2025.json"
     
-    def test_regex_pattern_validation(self, temp_dir):
+    def test_regex_pattern_validation(self, upload_fixture):
         """Test that regex patterns work correctly for various file names."""
-        upload_path = temp_dir / "upload"
-        upload_path.mkdir(parents=True, exist_ok=True)
+        upload_path = upload_fixture / "regex_patterns"
+        upload_path.mkdir()
         
         # Test various valid patterns
         valid_patterns = [
@@ -157,16 +164,13 @@ class TestFindLatestQCStatusFile:
             "QC_Status_Report_15AUG2025_235959.json",
         ]
         
-        for filename in valid_patterns:
-            file_path = upload_path / filename
-            with open(file_path, 'w') as f:
-                json.dump([{"test": "data"}], f)
+        _mk(upload_path, valid_patterns)
         
         latest_file = find_latest_qc_status_file(upload_path)
         
         assert latest_file is not None
         # Should find one of the valid files
-        assert latest_file.name in valid_patterns
+        assert latest_file.name in frozenset(valid_patterns)
 
 
 class TestCreateOutputDirectory:
@@ -174,13 +178,12 @@ class TestCreateOutputDirectory:
     
     def test_create_output_directory_default(self, temp_dir):
         """Test creating output directory with default path."""
-        with patch('src.cli.cli.Path') as mock_path:
-            mock_path.return_value = temp_dir
-            
-            output_dir = create_output_directory()
-            
-            assert output_dir is not None
-            assert isinstance(output_dir, Path)
+        output_dir = create_output_directory(path_factory=lambda *args: temp_dir)
+        
+        assert output_dir is not None
+        assert isinstance(output_dir, Path)
+        assert output_dir.parent == temp_dir
+        assert output_dir.exists()
     
     def test_create_output_directory_custom_path(self, temp_dir):
         """Test creating output directory with custom path."""
@@ -191,22 +194,24 @@ class TestCreateOutputDirectory:
         assert output_dir == custom_path
         assert output_dir.exists()
     
-    def test_create_output_directory_with_timestamp_format(self):
+    def test_create_output_directory_with_timestamp_format(self, temp_dir):
         """Test that output directory includes proper timestamp format."""
-        with patch('src.cli.cli.datetime') as mock_datetime:
-            mock_datetime.now.return_value.strftime.return_value = "12Aug2025_140530"
-            
-            with patch('src.cli.cli.Path') as mock_path_class:
-                mock_base_path = Mock()
-                mock_output_path = Mock()
-                mock_path_class.return_value = mock_base_path
-                mock_base_path.__truediv__.return_value = mock_output_path
-                mock_output_path.mkdir.return_value = None
-                
-                result = create_output_directory()
-                
-                # Check that the timestamp format is used
-                mock_datetime.now.return_value.strftime.assert_called_with('%d%b%Y_%H%M%S')
+        output_dir = create_output_directory(
+            path_factory=lambda *args: temp_dir,
+            now=lambda: datetime(2025, 8, 12, 14, 5, 30),
+        )
+        
+        assert output_dir.name == "REDCAP_Uploader_12Aug2025_140530"
+    
+    def test_create_output_directory_test_run_prefix(self, temp_dir):
+        """Test that test runs are labelled with a TEST_ prefix."""
+        output_dir = create_output_directory(
+            test_run=True,
+            path_factory=lambda *args: temp_dir,
+            now=lambda: datetime(2025, 8, 12, 14, 5, 30),
+        )
+        
+        assert output_dir.name == "TEST_REDCAP_Uploader_12Aug2025_140530"
 
 
 class TestSetupLogging:
@@ -232,6 +237,15 @@ class TestSetupLogging:
         # Check that handlers have formatters
         for handler in logger.handlers:
             assert handler.formatter is not None
+    
+    def test_setup_logging_repeated_call_reuses_handlers(self):
+        """Test that repeating an identical setup does not rebuild handlers."""
+        setup_logging(log_level="INFO", console_output=True)
+        handlers = list(logging.getLogger("uploader").handlers)
+        
+        setup_logging(log_level="INFO", console_output=True)
+        
+        assert logging.getLogger("uploader").handlers == handlers
 
 
 class TestCLIIntegration:
@@ -243,27 +257,21 @@ class TestCLIIntegration:
         upload_path.mkdir(parents=True, exist_ok=True)
         
         # Create files with valid patterns
-        for filename in test_file_patterns['valid_patterns']:
-            file_path = upload_path / filename
-            with open(file_path, 'w') as f:
-                json.dump([{"test": "data"}], f)
+        _mk(upload_path, test_file_patterns['valid_patterns'])
         
         # Create files with invalid patterns  
-        for filename in test_file_patterns['invalid_patterns']:
-            file_path = upload_path / filename
-            with open(file_path, 'w') as f:
-                json.dump([{"test": "data"}], f)
+        _mk(upload_path, test_file_patterns['invalid_patterns'])
         
         latest_file = find_latest_qc_status_file(upload_path)
         
         # Should find a valid file and ignore invalid ones
         assert latest_file is not None
-        assert latest_file.name in test_file_patterns['valid_patterns']
+        assert latest_file.name in frozenset(test_file_patterns['valid_patterns'])
     
-    def test_date_parsing_edge_cases(self, temp_dir):
+    def test_date_parsing_edge_cases(self, upload_fixture):
         """Test date parsing with edge cases."""
-        upload_path = temp_dir / "upload"
-        upload_path.mkdir(parents=True, exist_ok=True)
+        upload_path = upload_fixture / "date_edge_cases"
+        upload_path.mkdir()
         
         # Test edge date cases
         edge_cases = [
@@ -272,10 +280,7 @@ class TestCLIIntegration:
             "QC_Status_Report_31DEC2025.json",  # Year end
         ]
         
-        for filename in edge_cases:
-            file_path = upload_path / filename
-            with open(file_path, 'w') as f:
-                json.dump([{"test": "data"}], f)
+        _mk(upload_path, edge_cases)
         
         latest_file = find_latest_qc_status_file(upload_path)
         
@@ -295,10 +300,7 @@ class TestCLIIntegration:
             "QC_Status_Report_15AUG2025_115959.json",  # 1 second earlier
         ]
         
-        for filename in close_timestamps:
-            file_path = upload_path / filename
-            with open(file_path, 'w') as f:
-                json.dump([{"test": "data"}], f)
+        _mk(upload_path, close_timestamps)
         
         latest_file = find_latest_qc_status_file(upload_path)
         
@@ -317,10 +319,7 @@ class TestCLIIntegration:
             "QC_STATUS_REPORT_15AUG2025.JSON",  # All uppercase
         ]
         
-        for filename in case_variations:
-            file_path = upload_path / filename
-            with open(file_path, 'w') as f:
-                json.dump([{"test": "data"}], f)
+        _mk(upload_path, case_variations)
         
         latest_file = find_latest_qc_status_file(upload_path)
         
@@ -328,25 +327,19 @@ class TestCLIIntegration:
         assert latest_file is not None
         assert latest_file.name == "QC_Status_Report_15AUG2025.json"
     
-    def test_month_abbreviation_validation(self, temp_dir):
+    def test_month_abbreviation_validation(self, upload_fixture):
         """Test validation of month abbreviations."""
-        upload_path = temp_dir / "upload"
-        upload_path.mkdir(parents=True, exist_ok=True)
+        upload_path = upload_fixture / "month_abbreviations"
+        upload_path.mkdir()
         
         # Valid month abbreviations
         valid_months = ["JAN", "FEB", "MAR", "APR", "MAY", "JUN", 
                        "JUL", "AUG", "SEP", "OCT", "NOV", "DEC"]
         
-        for i, month in enumerate(valid_months):
-            filename = f"QC_Status_Report_15{month}2025.json"
-            file_path = upload_path / filename
-            with open(file_path, 'w') as f:
-                json.dump([{"test": "data"}], f)
+        _mk(upload_path, [f"QC_Status_Report_15{month}2025.json" for month in valid_months])
         
         # Invalid month
-        invalid_file = upload_path / "QC_Status_Report_15XXX2025.json"
-        with open(invalid_file, 'w') as f:
-            json.dump([{"test": "data"}], f)
+        _mk(upload_path, ["QC_Status_Report_15XXX2025.json"])
         
         latest_file = find_latest_qc_status_file(upload_path)
         
@@ -355,35 +348,24 @@ class TestCLIIntegration:
         assert "XXX" not in latest_file.name
         assert any(month in latest_file.name for month in valid_months)
     
-    @patch('src.cli.cli.QCDataUploader')
-    @patch('src.cli.cli.REDCapFetcher')
-    @patch('src.cli.cli.REDCapConfig.from_env')
-    @patch('src.cli.cli.Settings.from_env')
-    def test_cli_integration_with_mocked_components(self, mock_settings, mock_config, 
-                                                   mock_fetcher_class, mock_uploader_class,
-                                                   temp_dir, sample_qc_file):
+    def test_cli_integration_with_mocked_components(self, mocker):
         """Test CLI integration with mocked components."""
+        mock_settings = mocker.patch.object(cli_module.Settings, 'from_env')
+        mock_config = mocker.patch.object(cli_module.REDCapConfig, 'from_env')
+        mock_fetcher_class = mocker.patch.object(cli_module, 'REDCapFetcher')
+        mock_uploader_class = mocker.patch.object(cli_module, 'QCDataUploader')
+        
         # Setup mocks
         mock_settings.return_value = Mock()
         mock_config.return_value = Mock()
         
         mock_fetcher = Mock()
-        mock_fetcher.fetch_qc_status_data.return_value = {
-            'success': True,
-            'record_count': 3,
-            'data': []
-        }
-        mock_fetcher.save_fetched_data_to_output.return_value = {
-            'success': True,
-            'file_path': str(temp_dir / "backup.json")
-        }
+        mock_fetcher.fetch_qc_status_data.return_value = _FETCH_RESULT
+        mock_fetcher.save_fetched_data_to_output.return_value = _SAVE_RESULT
         mock_fetcher_class.return_value = mock_fetcher
         
         mock_uploader = Mock()
-        mock_uploader.upload_qc_status_data.return_value = {
-            'success': True,
-            'records_processed': 3
-        }
+        mock_uploader.upload_qc_status_data.return_value = _UPLOAD_RESULT
         mock_uploader_class.return_value = mock_uploader
         
         # This would test the actual CLI run command, but we'll just verify mocks are set up
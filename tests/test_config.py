@@ -1,21 +1,36 @@
 """Test suite for configuration classes based on actual implementation."""
 
-import os
-import sys
 from pathlib import Path
-from unittest.mock import patch
 
-# Add the project root to the path
-project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root))
+import pytest
 
 from src.config.redcap_config import REDCapConfig
 from src.config.settings import Settings
 
 
+@pytest.fixture(scope="session")
+def settings():
+    """Shared Settings instance for read-only attribute tests."""
+    return Settings()
+
+
+@pytest.fixture(scope="module")
+def settings_from_env():
+    """Settings built from the environment once per module."""
+    return Settings.from_env()
+
+
 class TestREDCapConfig:
     """Test REDCapConfig class with actual attributes."""
     
+    @pytest.fixture(scope="class")
+    def cfg(self):
+        """REDCapConfig shared by the payload tests, which never mutate it."""
+        return REDCapConfig(
+            api_url="https://test.redcap.edu/api/",
+            api_token="test_token"
+        )
+    
     def test_redcap_config_creation(self):
         """Test creating REDCapConfig with basic parameters."""
         config = REDCapConfig(
@@ -47,184 +62,184 @@ class TestREDCapConfig:
         assert config.max_retries == 5
         assert config.retry_delay == 2.0
     
-    def test_from_env_basic(self):
+    def test_from_env_basic(self, monkeypatch):
         """Test creating REDCapConfig from environment variables."""
-        env_vars = {
-            'REDCAP_API_URL': 'https://env.redcap.edu/api/',
-            'REDCAP_API_TOKEN': 'env_token_12345'
-        }
+        monkeypatch.setenv('REDCAP_API_URL', 'https://env.redcap.edu/api/')
+        monkeypatch.setenv('REDCAP_API_TOKEN', 'env_token_12345')
+        
+        config = REDCapConfig.from_env()
         
-        with patch.dict(os.environ, env_vars, clear=False):
-            config = REDCapConfig.from_env()
-            
-            assert config.api_url == 'https://env.redcap.edu/api/'
-            assert config.api_token == 'env_token_12345'
+        assert config.api_url == 'https://env.redcap.edu/api/'
+        assert config.api_token == 'env_token_12345'
     
-    def test_from_env_with_project_id(self):
+    def test_from_env_with_project_id(self, monkeypatch):
         """Test creating REDCapConfig from env with project ID."""
-        env_vars = {
-            'REDCAP_API_URL': 'https://project.redcap.edu/api/',
-            'REDCAP_API_TOKEN': 'project_token'
-        }
+        monkeypatch.setenv('REDCAP_API_URL', 'https://project.redcap.edu/api/')
+        monkeypatch.setenv('REDCAP_API_TOKEN', 'project_token')
         
-        with patch.dict(os.environ, env_vars, clear=False):
-            config = REDCapConfig.from_env(project_id="TEST_PROJECT")
-            
-            assert config.api_url == 'https://project.redcap.edu/api/'
-            assert config.api_token == 'project_token'
-            assert config.project_id == "TEST_PROJECT"
+        config = REDCapConfig.from_env(project_id="TEST_PROJECT")
+        
+        assert config.api_url == 'https://project.redcap.edu/api/'
+        assert config.api_token == 'project_token'
+        assert config.project_id == "TEST_PROJECT"
     
-    def test_get_export_payload(self):
-        """Test getting export payload."""
-        config = REDCapConfig(
-            api_url="https://test.redcap.edu/api/",
-            api_token="test_token"
-        )
+    def test_from_env_returns_independent_instances(self, monkeypatch):
+        """Test that each from_env call builds a fresh config that reflects the environment."""
+        monkeypatch.setenv('REDCAP_API_URL', 'https://fresh.redcap.edu/api/')
+        monkeypatch.setenv('REDCAP_API_TOKEN', 'first_token')
+        
+        first = REDCapConfig.from_env()
+        first.api_token = 'mutated_token'
+        assert REDCapConfig.from_env().api_token == 'first_token'
         
-        payload = config.get_export_payload()
+        monkeypatch.setenv('REDCAP_API_TOKEN', 'rotated_token')
+        assert REDCapConfig.from_env().api_token == 'rotated_token'
+    
+    def test_get_export_payload(self, cfg):
+        """Test getting export payload."""
+        payload = cfg.get_export_payload()
         
+        expected = {'token': "test_token", 'format': "json", 'content': "record"}
         assert isinstance(payload, dict)
-        assert 'token' in payload
-        assert 'content' in payload
-        assert 'format' in payload
-        assert payload['token'] == "test_token"
-        assert payload['format'] == "json"
+        assert expected.items() <= payload.items()
     
-    def test_get_export_payload_with_kwargs(self):
+    def test_get_export_payload_with_kwargs(self, cfg):
         """Test getting export payload with custom parameters."""
-        config = REDCapConfig(
-            api_url="https://test.redcap.edu/api/",
-            api_token="test_token"
-        )
-        
-        payload = config.get_export_payload(
+        payload = cfg.get_export_payload(
             records=['UDS001', 'UDS002'],
             fields=['ptid', 'qc_status']
         )
         
+        expected = {'records': ['UDS001', 'UDS002'], 'fields': ['ptid', 'qc_status']}
         assert isinstance(payload, dict)
-        assert 'records' in payload
-        assert 'fields' in payload
-        assert payload['records'] == ['UDS001', 'UDS002']
-        assert payload['fields'] == ['ptid', 'qc_status']
+        assert expected.items() <= payload.items()
     
-    def test_get_import_payload(self):
-        """Test getting import payload."""
-        config = REDCapConfig(
-            api_url="https://test.redcap.edu/api/",
-            api_token="test_token"
-        )
+    def test_returned_payload_mutation_not_shared(self, cfg):
+        """Test that modifying a returned payload does not leak into later payloads."""
+        payload = cfg.get_export_payload(records=['UDS001'])
+        payload['token'] = "changed"
+        
+        fresh = cfg.get_export_payload()
+        assert fresh['token'] == "test_token"
+        assert 'records' not in fresh
+    
+    def test_payload_reflects_updated_attributes(self):
+        """Test that payloads use the config's current token and format."""
+        config = REDCapConfig(api_url="https://test.redcap.edu/api/", api_token="old_token")
+        config.api_token = "new_token"
+        config.format = "csv"
         
+        assert config.get_export_payload()['token'] == "new_token"
+        assert config.get_import_payload(data="[]")['format'] == "csv"
+    
+    def test_get_import_payload(self, cfg):
+        """Test getting import payload."""
         test_data = '[{"record_id": "UDS001", "ptid": "UDS001"}]'
-        payload = config.get_import_payload(data=test_data)
+        payload = cfg.get_import_payload(data=test_data)
         
+        expected = {'token': "test_token", 'format': "json", 'content': 'record', 'data': test_data}
         assert isinstance(payload, dict)
-        assert 'token' in payload
-        assert 'content' in payload
-        assert 'format' in payload
-        assert 'data' in payload
-        assert payload['data'] == test_data
-        assert payload['content'] == 'record'
+        assert expected.items() <= payload.items()
     
-    def test_get_import_payload_with_kwargs(self):
+    def test_get_import_payload_with_kwargs(self, cfg):
         """Test getting import payload with custom parameters."""
-        config = REDCapConfig(
-            api_url="https://test.redcap.edu/api/",
-            api_token="test_token"
-        )
-        
         test_data = '[{"record_id": "UDS001"}]'
-        payload = config.get_import_payload(
+        payload = cfg.get_import_payload(
             data=test_data,
             overwriteBehavior='overwrite',
             returnContent='ids'
         )
         
-        assert payload['overwriteBehavior'] == 'overwrite'
-        assert payload['returnContent'] == 'ids'
+        expected = {'data': test_data, 'overwriteBehavior': 'overwrite', 'returnContent': 'ids'}
+        assert expected.items() <= payload.items()
 
 
 class TestSettings:
     """Test Settings class with actual attributes."""
     
-    def test_settings_creation(self):
-        """Test creating Settings instance."""
-        settings = Settings()
-        
-        # Test some key attributes
-        assert hasattr(settings, 'BASE_DIR')
-        assert hasattr(settings, 'DATA_DIR')
-        assert hasattr(settings, 'LOGS_DIR')
-        assert hasattr(settings, 'OUTPUT_DIR')
-        assert hasattr(settings, 'LOG_LEVEL')
-        assert hasattr(settings, 'DRY_RUN_DEFAULT')
+    @pytest.mark.parametrize(
+        "attr, expected_type",
+        [
+            ('BASE_DIR', (Path, str)),
+            ('DATA_DIR', (Path, str)),
+            ('LOGS_DIR', (Path, str)),
+            ('OUTPUT_DIR', (Path, str)),
+            ('BACKUPS_DIR', (Path, str)),
+            ('LOG_LEVEL', str),
+            ('LOG_FORMAT', str),
+            ('LOG_TO_FILE', bool),
+            ('LOG_TO_CONSOLE', bool),
+            ('DRY_RUN_DEFAULT', bool),
+            ('BACKUP_BEFORE_UPLOAD', bool),
+            ('VALIDATE_DATA', bool),
+            ('CHECK_FILE_CHANGES', bool),
+            ('BATCH_SIZE', int),
+            ('MAX_RETRIES', int),
+            ('RETRY_DELAY', (int, float)),
+        ],
+    )
+    def test_settings_attribute_types(self, settings, attr, expected_type):
+        """Test Settings exposes each attribute with the expected type."""
+        assert isinstance(getattr(settings, attr), expected_type)
     
-    def test_settings_directory_attributes(self):
-        """Test Settings directory attributes."""
-        settings = Settings()
-        
-        # These should be Path-like or string attributes
-        assert settings.BASE_DIR is not None
-        assert settings.DATA_DIR is not None
-        assert settings.LOGS_DIR is not None
-        assert settings.OUTPUT_DIR is not None
-        assert settings.BACKUPS_DIR is not None
+    def test_settings_numeric_ranges(self, settings):
+        """Test Settings numeric attributes hold sensible values."""
+        assert settings.BATCH_SIZE > 0
+        assert settings.MAX_RETRIES >= 0
+        assert settings.RETRY_DELAY >= 0
+    
+    def test_settings_log_format_not_empty(self, settings):
+        """Test the default log format is populated."""
+        assert len(settings.LOG_FORMAT) > 0
     
-    def test_settings_configuration_attributes(self):
-        """Test Settings configuration attributes."""
+    def test_settings_directories_created_lazily(self, temp_dir, monkeypatch):
+        """Test that directories are only created when first accessed."""
+        data_dir = temp_dir / "lazy_data"
+        monkeypatch.setenv('DATA_DIR', str(data_dir))
+        
         settings = Settings()
+        assert not data_dir.exists()
         
-        # Test configuration values
-        assert isinstance(settings.LOG_LEVEL, str)
-        assert isinstance(settings.DRY_RUN_DEFAULT, bool)
-        assert isinstance(settings.BACKUP_BEFORE_UPLOAD, bool)
-        assert isinstance(settings.VALIDATE_DATA, bool)
-        assert isinstance(settings.CHECK_FILE_CHANGES, bool)
+        assert settings.DATA_DIR == data_dir
+        assert data_dir.is_dir()
     
-    def test_settings_numeric_attributes(self):
-        """Test Settings numeric attributes."""
+    def test_settings_directories_resolved_at_construction(self, temp_dir, monkeypatch):
+        """Test that directory paths come from the environment seen at construction."""
+        data_dir = temp_dir / "constructed_data"
+        monkeypatch.setenv('DATA_DIR', str(data_dir))
+        
         settings = Settings()
+        monkeypatch.setenv('DATA_DIR', str(temp_dir / "later_data"))
         
-        # Test numeric settings
-        assert isinstance(settings.BATCH_SIZE, int)
-        assert isinstance(settings.MAX_RETRIES, int)
-        assert isinstance(settings.RETRY_DELAY, (int, float))
-        assert settings.BATCH_SIZE > 0
-        assert settings.MAX_RETRIES >= 0
-        assert settings.RETRY_DELAY >= 0
-    
-    def test_from_env_method_exists(self):
+        assert settings.DATA_DIR == data_dir
+        assert not (temp_dir / "later_data").exists()
+
+    def test_from_env_method_exists(self, settings_from_env):
         """Test that from_env method exists and works."""
-        # Test that the method exists and can be called
-        settings = Settings.from_env()
+        settings = settings_from_env
         
         assert isinstance(settings, Settings)
         assert hasattr(settings, 'BASE_DIR')
         assert hasattr(settings, 'LOG_LEVEL')
     
-    def test_from_env_with_environment_variables(self):
+    def test_from_env_with_environment_variables(self, monkeypatch):
         """Test Settings from_env with environment variables."""
         # Test with some environment variables set
-        env_vars = {
-            'UDSV4_LOG_LEVEL': 'DEBUG',
-            'UDSV4_DRY_RUN': 'true',
-            'UDSV4_BATCH_SIZE': '100'
-        }
+        monkeypatch.setenv('UDSV4_LOG_LEVEL', 'DEBUG')
+        monkeypatch.setenv('UDSV4_DRY_RUN', 'true')
+        monkeypatch.setenv('UDSV4_BATCH_SIZE', '100')
         
-        with patch.dict(os.environ, env_vars, clear=False):
-            try:
-                settings = Settings.from_env()
-                assert isinstance(settings, Settings)
-                # The implementation might or might not use these env vars
-                # Just ensure it doesn't crash
-            except Exception:
-                # Some env vars might not be supported, that's okay
-                pass
+        try:
+            settings = Settings.from_env()
+            assert isinstance(settings, Settings)
+            # The implementation might or might not use these env vars
+            # Just ensure it doesn't crash
+        except Exception:
+            # Some env vars might not be supported, that's okay
+            pass
     
-    def test_file_paths_are_valid(self):
+    def test_file_paths_are_valid(self, settings):
         """Test that file paths in settings are valid."""
-        settings = Settings()
-        
         # Test that paths can be converted to Path objects
         base_dir = Path(settings.BASE_DIR) if settings.BASE_DIR else Path.cwd()
         data_dir = Path(settings.DATA_DIR) if settings.DATA_DIR else base_dir / "data"
@@ -235,26 +250,14 @@ class TestSettings:
         assert isinstance(data_dir, Path)
         assert isinstance(logs_dir, Path)
     
-    def test_default_forms_and_events(self):
+    def test_default_forms_and_events(self, settings):
         """Test default forms and events settings."""
-        settings = Settings()
-        
         # These should be lists or None
         if hasattr(settings, 'DEFAULT_FORMS'):
             assert isinstance(settings.DEFAULT_FORMS, (list, type(None)))
         
         if hasattr(settings, 'DEFAULT_EVENTS'):
             assert isinstance(settings.DEFAULT_EVENTS, (list, type(None)))
-    
-    def test_log_configuration(self):
-        """Test logging configuration settings."""
-        settings = Settings()
-        
-        # Test logging-related settings
-        assert isinstance(settings.LOG_TO_FILE, bool)
-        assert isinstance(settings.LOG_TO_CONSOLE, bool)
-        assert isinstance(settings.LOG_FORMAT, str)
-        assert len(settings.LOG_FORMAT) > 0
 
 
 class TestConfigurationIntegration:
@@ -274,16 +277,13 @@ class TestConfigurationIntegration:
         assert redcap_config.api_url == "https://integration.redcap.edu/api/"
         assert hasattr(settings, 'BASE_DIR')
     
-    def test_from_env_integration(self):
+    def test_from_env_integration(self, monkeypatch):
         """Test creating both configs from environment."""
-        env_vars = {
-            'REDCAP_API_URL': 'https://integration.redcap.edu/api/',
-            'REDCAP_API_TOKEN': 'integration_token'
-        }
+        monkeypatch.setenv('REDCAP_API_URL', 'https://integration.redcap.edu/api/')
+        monkeypatch.setenv('REDCAP_API_TOKEN', 'integration_token')
         
-        with patch.dict(os.environ, env_vars, clear=False):
-            redcap_config = REDCapConfig.from_env()
-            settings = Settings.from_env()
-            
-            assert redcap_config.api_url == 'https://integration.redcap.edu/api/'
-            assert isinstance(settings, Settings)
+        redcap_config = REDCapConfig.from_env()
+        settings = Settings.from_env()
+        
+        assert redcap_config.api_url == 'https://integration.redcap.edu/api/'
+        assert isinstance(settings, Settings)
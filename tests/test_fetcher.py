@@ -2,24 +2,48 @@
 
 import json
 from pathlib import Path
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import Mock, patch
+import pytest
 import requests
-import sys
-
-# Add the project root to the path
-project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root))
 
 from src.uploader.fetcher import REDCapFetcher
 
+# Class attributes plus the instance attributes Response sets in __init__
+_RESPONSE_SPEC = [*dir(requests.Response), *requests.Response.__attrs__]
+
+_EXPECTED_IDS = frozenset({'UDS001', 'UDS002', 'UDS003'})
+_EXPECTED_EVENTS = frozenset({'baseline_arm_1', 'followup_1_arm_1'})
+
 
 class TestREDCapFetcher:
     """Test REDCapFetcher class functionality."""
     
-    def test_init(self, mock_redcap_config, test_logger):
+    @pytest.fixture(scope="class")
+    def ok_response(self):
+        """Factory for successful (HTTP 200) API response mocks."""
+        def make(payload):
+            response = Mock(spec_set=_RESPONSE_SPEC)
+            response.status_code = 200
+            response.ok = True
+            response.json.return_value = payload
+            response.raise_for_status.return_value = None
+            return response
+        
+        return make
+    
+    @pytest.fixture
+    def fetcher(self, mock_redcap_config):
+        """REDCapFetcher built from the mock configuration."""
+        return REDCapFetcher(mock_redcap_config)
+    
+    @pytest.fixture(autouse=True)
+    def _mock_post(self):
+        """Patch requests.Session.post so no test in this class reaches the network."""
+        with patch('requests.Session.post') as mock_post:
+            yield mock_post
+    
+    def test_init(self, fetcher, mock_redcap_config):
         """Test REDCapFetcher initialization."""
-        fetcher = REDCapFetcher(mock_redcap_config)
-        
         assert fetcher.config == mock_redcap_config
         assert fetcher.logger is not None
         assert fetcher.session is not None
@@ -27,10 +51,8 @@ class TestREDCapFetcher:
         assert 'ptid' in fetcher.qc_status_fields
         assert 'qc_status' in fetcher.qc_status_fields
     
-    def test_analyze_upload_data_valid_file(self, temp_dir, sample_qc_file, mock_redcap_config, test_logger):
+    def test_analyze_upload_data_valid_file(self, fetcher, temp_dir, sample_qc_file):
         """Test analyzing valid upload data."""
-        fetcher = REDCapFetcher(mock_redcap_config)
-        
         result = fetcher.analyze_upload_data(temp_dir / "data")
         
         assert result['success'] is True
@@ -39,10 +61,8 @@ class TestREDCapFetcher:
         assert 'events_needed' in result
         assert len(result['records_to_fetch']) > 0
     
-    def test_analyze_upload_data_no_files(self, temp_dir, mock_redcap_config, test_logger):
+    def test_analyze_upload_data_no_files(self, fetcher, temp_dir):
         """Test analyzing upload data when no files present."""
-        fetcher = REDCapFetcher(mock_redcap_config)
-        
         empty_dir = temp_dir / "empty"
         empty_dir.mkdir()
         
@@ -51,10 +71,8 @@ class TestREDCapFetcher:
         assert result['success'] is False
         assert 'error' in result
     
-    def test_analyze_upload_data_invalid_json(self, temp_dir, mock_redcap_config, test_logger):
+    def test_analyze_upload_data_invalid_json(self, fetcher, temp_dir):
         """Test analyzing upload data with invalid JSON."""
-        fetcher = REDCapFetcher(mock_redcap_config)
-        
         # Create invalid JSON file
         invalid_file = temp_dir / "data" / "invalid.json"
         invalid_file.parent.mkdir(parents=True, exist_ok=True)
@@ -66,32 +84,22 @@ class TestREDCapFetcher:
         assert result['success'] is False
         assert 'error' in result
     
-    @patch('requests.Session.post')
-    def test_fetch_qc_status_data_success(self, mock_post, mock_redcap_config, test_logger, sample_qc_data):
+    def test_fetch_qc_status_data_success(self, fetcher, _mock_post, sample_qc_data, ok_response):
         """Test successful QC status data fetching."""
-        fetcher = REDCapFetcher(mock_redcap_config)
-        
         # Mock successful API response
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = sample_qc_data
-        mock_response.raise_for_status.return_value = None
-        mock_post.return_value = mock_response
+        _mock_post.return_value = ok_response(sample_qc_data)
         
         result = fetcher.fetch_qc_status_data()
         
         assert result['success'] is True
         assert result['record_count'] == len(sample_qc_data)
         assert 'data' in result
-        assert mock_post.called
+        assert _mock_post.called
     
-    @patch('requests.Session.post')
-    def test_fetch_qc_status_data_api_error(self, mock_post, mock_redcap_config, test_logger):
+    def test_fetch_qc_status_data_api_error(self, fetcher, _mock_post):
         """Test QC status data fetching with API error."""
-        fetcher = REDCapFetcher(mock_redcap_config)
-        
         # Mock API error
-        mock_post.side_effect = requests.RequestException("API Error")
+        _mock_post.side_effect = requests.RequestException("API Error")
         
         result = fetcher.fetch_qc_status_data()
         
@@ -99,35 +107,26 @@ class TestREDCapFetcher:
         assert 'error' in result
         assert 'API Error' in result['error']
     
-    @patch('requests.Session.post')
-    def test_fetch_qc_status_data_invalid_response(self, mock_post, mock_redcap_config, test_logger):
+    def test_fetch_qc_status_data_invalid_response(self, fetcher, _mock_post):
         """Test QC status data fetching with invalid response."""
-        fetcher = REDCapFetcher(mock_redcap_config)
-        
         # Mock invalid response
-        mock_response = Mock()
+        mock_response = Mock(spec_set=_RESPONSE_SPEC)
         mock_response.status_code = 200
+        mock_response.ok = True
         mock_response.json.side_effect = json.JSONDecodeError("Invalid JSON", "", 0)
         mock_response.text = "Invalid response"
         mock_response.raise_for_status.return_value = None
-        mock_post.return_value = mock_response
+        _mock_post.return_value = mock_response
         
         result = fetcher.fetch_qc_status_data()
         
         assert result['success'] is False
         assert 'error' in result
     
-    @patch('requests.Session.post')
-    def test_fetch_qc_status_form_data(self, mock_post, mock_redcap_config, test_logger, sample_qc_data):
+    def test_fetch_qc_status_form_data(self, fetcher, _mock_post, sample_qc_data, ok_response):
         """Test fetching QC status form data."""
-        fetcher = REDCapFetcher(mock_redcap_config)
-        
-        # Mock successful API response
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = sample_qc_data[:2]  # Return first 2 records
-        mock_response.raise_for_status.return_value = None
-        mock_post.return_value = mock_response
+        # Mock successful API response returning the first 2 records
+        _mock_post.return_value = ok_response(sample_qc_data[:2])
         
         result = fetcher.fetch_qc_status_form_data(
             record_ids=['UDS001', 'UDS002'],
@@ -136,16 +135,14 @@ class TestREDCapFetcher:
         
         assert result['success'] is True
         assert result['record_count'] == 2
-        assert mock_post.called
+        assert _mock_post.called
         
         # Check that the API was called
-        call_args = mock_post.call_args
+        call_args = _mock_post.call_args
         assert call_args is not None
     
-    def test_save_fetched_data_to_output(self, temp_dir, mock_redcap_config, test_logger, sample_qc_data):
+    def test_save_fetched_data_to_output(self, fetcher, temp_dir, sample_qc_data):
         """Test saving fetched data to output directory."""
-        fetcher = REDCapFetcher(mock_redcap_config)
-        
         fetch_result = {
             'success': True,
             'data': sample_qc_data,
@@ -170,10 +167,8 @@ class TestREDCapFetcher:
             saved_data = json.load(f)
         assert saved_data == sample_qc_data
     
-    def test_save_fetched_data_failed_fetch(self, temp_dir, mock_redcap_config, test_logger):
+    def test_save_fetched_data_failed_fetch(self, fetcher, temp_dir):
         """Test saving fetched data when fetch failed."""
-        fetcher = REDCapFetcher(mock_redcap_config)
-        
         fetch_result = {
             'success': False,
             'error': 'Test error'
@@ -189,10 +184,8 @@ class TestREDCapFetcher:
         assert result['success'] is False
         assert 'error' in result
     
-    def test_save_backup_files_to_directory(self, temp_dir, mock_redcap_config, test_logger, sample_qc_data):
+    def test_save_backup_files_to_directory(self, fetcher, temp_dir, sample_qc_data):
         """Test saving backup files to directory."""
-        fetcher = REDCapFetcher(mock_redcap_config)
-        
         fetch_result = {
             'success': True,
             'data': sample_qc_data,
@@ -211,10 +204,8 @@ class TestREDCapFetcher:
         assert 'files_created' in result
         assert len(result['files_created']) > 0
     
-    def test_filter_qc_status_subset(self, mock_redcap_config, test_logger, sample_qc_data):
+    def test_filter_qc_status_subset(self, fetcher, sample_qc_data):
         """Test filtering QC status subset."""
-        fetcher = REDCapFetcher(mock_redcap_config)
-        
         upload_data = [
             {"record_id": "UDS001", "redcap_event_name": "baseline_arm_1"},
             {"record_id": "UDS002", "redcap_event_name": "baseline_arm_1"}
@@ -225,40 +216,33 @@ class TestREDCapFetcher:
         assert len(result) == 2
         assert all(record['record_id'] in ['UDS001', 'UDS002'] for record in result)
     
-    def test_get_unique_record_identifiers(self, mock_redcap_config, test_logger, sample_qc_data):
+    def test_get_unique_record_identifiers(self, fetcher, sample_qc_data):
         """Test getting unique record identifiers."""
-        fetcher = REDCapFetcher(mock_redcap_config)
-        
         identifiers = fetcher._get_unique_record_identifiers(sample_qc_data)
         
-        assert 'record_ids' in identifiers
-        assert 'events' in identifiers
-        assert len(identifiers['record_ids']) == 3  # UDS001, UDS002, UDS003
-        assert 'baseline_arm_1' in identifiers['events']
-        assert 'followup_1_arm_1' in identifiers['events']
+        assert set(identifiers['record_ids']) == _EXPECTED_IDS
+        assert _EXPECTED_EVENTS <= set(identifiers['events'])
     
-    def test_validate_api_response(self, mock_redcap_config, test_logger):
+    def test_validate_api_response(self, fetcher):
         """Test API response validation."""
-        fetcher = REDCapFetcher(mock_redcap_config)
-        
         # Valid response
-        valid_response = Mock()
+        valid_response = Mock(spec_set=_RESPONSE_SPEC)
         valid_response.status_code = 200
+        valid_response.ok = True
         valid_response.json.return_value = [{"record_id": "UDS001"}]
         
         assert fetcher._validate_api_response(valid_response) is True
         
         # Invalid status code
-        invalid_response = Mock()
+        invalid_response = Mock(spec_set=_RESPONSE_SPEC)
         invalid_response.status_code = 400
+        invalid_response.ok = False
         invalid_response.raise_for_status.side_effect = requests.HTTPError("Bad request")
         
         assert fetcher._validate_api_response(invalid_response) is False
     
-    def test_prepare_api_request(self, mock_redcap_config, test_logger):
+    def test_prepare_api_request(self, fetcher, mock_redcap_config):
         """Test API request preparation."""
-        fetcher = REDCapFetcher(mock_redcap_config)
-        
         request_data = fetcher._prepare_api_request(
             content='record',
             format_type='json',
@@ -274,32 +258,23 @@ class TestREDCapFetcher:
         assert request_data['fields'] == 'ptid,qc_status'
         assert request_data['events'] == 'baseline_arm_1'
     
-    @patch('requests.Session.post')
-    def test_fetch_with_retry_logic(self, mock_post, mock_redcap_config, test_logger):
+    def test_fetch_with_retry_logic(self, fetcher, _mock_post, ok_response):
         """Test fetch with retry logic on temporary failures."""
-        fetcher = REDCapFetcher(mock_redcap_config)
-        
         # First call fails, second succeeds
-        mock_response_fail = Mock()
+        mock_response_fail = Mock(spec_set=_RESPONSE_SPEC)
         mock_response_fail.status_code = 500
+        mock_response_fail.ok = False
         mock_response_fail.raise_for_status.side_effect = requests.HTTPError("Server error")
         
-        mock_response_success = Mock()
-        mock_response_success.status_code = 200
-        mock_response_success.json.return_value = []
-        mock_response_success.raise_for_status.return_value = None
-        
-        mock_post.side_effect = [mock_response_fail, mock_response_success]
+        _mock_post.side_effect = [mock_response_fail, ok_response([])]
         
         result = fetcher.fetch_qc_status_data(max_retries=2)
         
         assert result['success'] is True
-        assert mock_post.call_count == 2
+        assert _mock_post.call_count == 2
     
-    def test_error_handling_malformed_data(self, temp_dir, mock_redcap_config, test_logger):
+    def test_error_handling_malformed_data(self, fetcher, temp_dir):
         """Test error handling with malformed data files."""
-        fetcher = REDCapFetcher(mock_redcap_config)
-        
         # Create file with malformed data structure
         malformed_file = temp_dir / "data" / "malformed.json"
         malformed_file.parent.mkdir(parents=True, exist_ok=True)
@@ -317,25 +292,9 @@ class TestREDCapFetcher:
         assert result['success'] is False
         assert 'error' in result
     
-    def test_large_dataset_handling(self, temp_dir, mock_redcap_config, test_logger):
+    def test_large_dataset_handling(self, fetcher, temp_dir, link_seed):
         """Test handling of large datasets."""
-        fetcher = REDCapFetcher(mock_redcap_config)
-        
-        # Create large dataset
-        large_dataset = []
-        for i in range(1000):
-            large_dataset.append({
-                "record_id": f"UDS{i:04d}",
-                "redcap_event_name": "baseline_arm_1",
-                "ptid": f"UDS{i:04d}",
-                "qc_status": "1"
-            })
-        
-        large_file = temp_dir / "data" / "large_dataset.json"
-        large_file.parent.mkdir(parents=True, exist_ok=True)
-        
-        with open(large_file, 'w') as f:
-            json.dump(large_dataset, f)
+        link_seed("large_dataset.json", temp_dir / "data" / "large_dataset.json")
         
         result = fetcher.analyze_upload_data(temp_dir / "data")
         
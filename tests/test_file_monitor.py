@@ -1,17 +1,16 @@
 """Simplified test suite for FileMonitor functionality."""
 
 import os
-import sys
 import json
 import hashlib
-from pathlib import Path
-from unittest.mock import Mock
-
-# Add the project root to the path
-project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root))
+from unittest.mock import Mock, patch
+import pytest
 
 from src.uploader.file_monitor import FileMonitor, FileInfo
+from tests._fastjson import dump_bytes
+
+_HELLO = b"Hello, World!"
+_HELLO_SHA256 = hashlib.sha256(_HELLO).hexdigest()
 
 
 class TestFileInfo:
@@ -73,7 +72,7 @@ class TestFileInfo:
 class TestFileMonitor:
     """Test FileMonitor class with actual methods."""
     
-    def test_init(self, temp_dir, test_logger):
+    def test_init(self, temp_dir):
         """Test FileMonitor initialization."""
         monitor = FileMonitor(temp_dir)
         
@@ -82,26 +81,21 @@ class TestFileMonitor:
         assert monitor.tracking_file == temp_dir / "file_tracking.json"
         assert isinstance(monitor._file_history, dict)
     
-    def test_get_file_hash(self, temp_dir, test_logger):
+    def test_get_file_hash(self, temp_dir):
         """Test getting file hash."""
         monitor = FileMonitor(temp_dir)
         
         # Create test file with known content
         test_file = temp_dir / "test.txt"
-        test_content = "Hello, World!"
-        with open(test_file, 'w', encoding='utf-8') as f:
-            f.write(test_content)
+        test_file.write_bytes(_HELLO)
         
         file_hash = monitor.get_file_hash(test_file)
         
-        # Calculate expected hash
-        expected_hash = hashlib.sha256(test_content.encode('utf-8')).hexdigest()
-        
-        assert file_hash == expected_hash
+        assert file_hash == _HELLO_SHA256
         assert isinstance(file_hash, str)
         assert len(file_hash) == 64  # SHA256 hex string length
     
-    def test_get_file_hash_nonexistent_file(self, temp_dir, test_logger):
+    def test_get_file_hash_nonexistent_file(self, temp_dir):
         """Test getting hash for non-existent file."""
         monitor = FileMonitor(temp_dir)
         
@@ -115,7 +109,7 @@ class TestFileMonitor:
             # This is also acceptable behavior
             pass
     
-    def test_has_file_changed_new_file(self, temp_dir, test_logger):
+    def test_has_file_changed_new_file(self, temp_dir):
         """Test detecting new file."""
         monitor = FileMonitor(temp_dir)
         
@@ -130,7 +124,7 @@ class TestFileMonitor:
         
         assert has_changed is True
     
-    def test_has_file_changed_existing_unchanged_file(self, temp_dir, test_logger):
+    def test_has_file_changed_existing_unchanged_file(self, temp_dir):
         """Test detecting unchanged file."""
         monitor = FileMonitor(temp_dir)
         
@@ -148,7 +142,7 @@ class TestFileMonitor:
         
         assert has_changed is False
     
-    def test_has_file_changed_modified_file(self, temp_dir, test_logger):
+    def test_has_file_changed_modified_file(self, temp_dir):
         """Test detecting modified file."""
         monitor = FileMonitor(temp_dir)
         
@@ -168,15 +162,13 @@ class TestFileMonitor:
         
         assert has_changed is True
     
-    def test_mark_file_processed(self, temp_dir, test_logger):
+    def test_mark_file_processed(self, temp_dir):
         """Test marking file as processed."""
         monitor = FileMonitor(temp_dir)
         
         # Create test file
         test_file = temp_dir / "processed_file.json"
-        test_data = [{"record_id": "UDS001"}, {"record_id": "UDS002"}]
-        with open(test_file, 'w') as f:
-            json.dump(test_data, f)
+        test_file.write_bytes(b"[]")
         
         monitor.mark_file_processed(test_file, records_count=2)
         
@@ -188,17 +180,18 @@ class TestFileMonitor:
         assert file_info.records_count == 2
         assert file_info.path == file_path_str
     
-    def test_get_file_status(self, temp_dir, test_logger):
+    def test_get_file_status(self, temp_dir):
         """Test getting file status."""
         monitor = FileMonitor(temp_dir)
         
-        # Create and process some files
+        # Create some files and process them in one batch
+        files = []
         for i in range(3):
             test_file = temp_dir / f"status_file_{i}.json"
-            with open(test_file, 'w') as f:
-                json.dump([{"record_id": f"UDS{i:03d}"}], f)
-            
-            monitor.mark_file_processed(test_file, records_count=1)
+            test_file.write_bytes(dump_bytes([{"record_id": f"UDS{i:03d}"}]))
+            files.append(test_file)
+        
+        monitor.mark_files_processed_bulk(files, counts=[1, 1, 1])
         
         status = monitor.get_file_status()
         
@@ -212,7 +205,29 @@ class TestFileMonitor:
             # Check for common keys that might exist
             assert any(key in file_status for key in ['path', 'file', 'records_count'])
     
-    def test_get_new_files(self, temp_dir, test_logger, sample_qc_data):
+    def test_mark_files_processed_bulk_saves_once(self, temp_dir):
+        """Test bulk marking records every file and writes the history once."""
+        monitor = FileMonitor(temp_dir)
+        
+        files = [temp_dir / f"bulk_file_{i}.json" for i in range(3)]
+        for test_file in files:
+            test_file.write_bytes(b"[]")
+        
+        with patch.object(monitor, '_save_history', wraps=monitor._save_history) as save:
+            monitor.mark_files_processed_bulk(files, counts=[1, 2, 3])
+        
+        save.assert_called_once()
+        assert [monitor._file_history[str(f)].records_count for f in files] == [1, 2, 3]
+        assert FileMonitor(temp_dir)._file_history == monitor._file_history
+    
+    def test_mark_files_processed_bulk_count_mismatch(self, temp_dir):
+        """Test bulk marking rejects a counts list of the wrong length."""
+        monitor = FileMonitor(temp_dir)
+        
+        with pytest.raises(ValueError):
+            monitor.mark_files_processed_bulk([temp_dir / "a.json"], counts=[1, 2])
+    
+    def test_get_new_files(self, temp_dir, sample_qc_data):
         """Test getting new files."""
         monitor = FileMonitor(temp_dir)
         
@@ -236,28 +251,24 @@ class TestFileMonitor:
         assert unprocessed_file in new_files
         assert processed_file not in new_files
     
-    def test_save_and_load_history(self, temp_dir, test_logger):
+    def test_save_and_load_history(self, temp_dir):
         """Test saving and loading history."""
         # Create monitor and process some files
         monitor = FileMonitor(temp_dir)
         
         test_file = temp_dir / "save_load_file.json"
-        with open(test_file, 'w') as f:
-            json.dump([{"test": "data"}], f)
+        test_file.write_bytes(dump_bytes([{"test": "data"}]))
         
         monitor.mark_file_processed(test_file, records_count=1)
         
         # Create new monitor (should load existing history)
         new_monitor = FileMonitor(temp_dir)
         
-        # History should be loaded
-        file_path_str = str(test_file)
-        assert file_path_str in new_monitor._file_history
-        
-        file_info = new_monitor._file_history[file_path_str]
-        assert file_info.records_count == 1
+        # History should round-trip unchanged
+        assert new_monitor._file_history == monitor._file_history
+        assert new_monitor._file_history[str(test_file)].records_count == 1
     
-    def test_cleanup_old_entries(self, temp_dir, test_logger):
+    def test_cleanup_old_entries(self, temp_dir):
         """Test cleaning up old entries."""
         monitor = FileMonitor(temp_dir)
         
@@ -275,7 +286,7 @@ class TestFileMonitor:
             # Method might not exist, that's okay
             pass
     
-    def test_file_hash_consistency(self, temp_dir, test_logger):
+    def test_file_hash_consistency(self, temp_dir):
         """Test that file hash calculation is consistent."""
         monitor = FileMonitor(temp_dir)
         
@@ -286,35 +297,23 @@ class TestFileMonitor:
         with open(test_file, 'w') as f:
             json.dump(test_content, f, sort_keys=True)  # Ensure consistent ordering
         
-        # Calculate hash multiple times
-        hash1 = monitor.get_file_hash(test_file)
-        hash2 = monitor.get_file_hash(test_file)
+        # Hash must match an independent digest of the file contents
+        file_hash = monitor.get_file_hash(test_file)
+        expected_hash = hashlib.sha256(test_file.read_bytes()).hexdigest()
         
-        assert hash1 == hash2
-        assert hash1 is not None
-        assert len(hash1) > 0
+        assert file_hash == expected_hash
     
-    def test_large_file_handling(self, temp_dir, test_logger):
+    def test_large_file_handling(self, temp_dir, link_seed):
         """Test handling of large files."""
         monitor = FileMonitor(temp_dir)
         
-        # Create large file
-        large_file = temp_dir / "large_file.json"
-        large_data = []
-        for i in range(1000):
-            large_data.append({
-                "record_id": f"UDS{i:04d}",
-                "data": f"Large dataset entry {i}" * 10  # Make it bigger
-            })
-        
-        with open(large_file, 'w') as f:
-            json.dump(large_data, f)
+        # Link in the large file
+        large_file = link_seed("large_dataset.json", temp_dir / "large_file.json")
         
         # Should handle large file without issues
         file_hash = monitor.get_file_hash(large_file)
         
-        assert file_hash is not None
-        assert len(file_hash) > 0
+        assert file_hash == hashlib.sha256(large_file.read_bytes()).hexdigest()
         
         # Should be able to mark as processed
         monitor.mark_file_processed(large_file, records_count=1000)